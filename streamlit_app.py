@@ -1,7 +1,23 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from math import expm1, log1p
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+# Current regime IR brackets: upper bounds (days) and the rate for each bracket
+IR_BRACKETS = np.array([180, 360, 720])
+IR_RATES = np.array([0.225, 0.2, 0.175, 0.15])
+IR_BRACKET_LABELS = ("Até 180 dias", "181 a 360 dias", "361 a 720 dias", "Acima de 720 dias")
+
+# Standard scenario terms; custom analyses are capped at the same count
+STANDARD_SCENARIO_DAYS = (30, 90, 180, 365, 720, 1080)
+STANDARD_SCENARIO_LABELS = ("1 mês", "3 meses", "6 meses", "1 ano", "2 anos", "3 anos")
+MAX_SCENARIOS = len(STANDARD_SCENARIO_DAYS)
+
+# Config passed to every st.plotly_chart call; hiding the modebar skips its toolbar setup in the browser
+PLOTLY_CONFIG = {'displayModeBar': False}
 
 def default_tax_rate(tax_rate_old, investment_type):
     if investment_type == 'Tributável':
@@ -14,11 +30,471 @@ def default_tax_rate(tax_rate_old, investment_type):
 
 def calculate_compound_return(rate, days):
     """Calculate compound return for given rate and period"""
-    return ((1 + rate/100) ** (days/365)) - 1
+    return expm1(log1p(rate/100) * (days/365))
+
+def compound_batch(rate, days, tax_old, tax_new):
+    """Calculate gross and net period returns for an array of periods"""
+    gross = np.expm1(np.log1p(rate / 100) * (days / 365))
+    return gross, gross * (1 - tax_old), gross * (1 - tax_new)
+
+@st.cache_resource(show_spinner=False)
+def _currency_formatter():
+    """Return a memoized formatter that outlives script reruns"""
+    @lru_cache(maxsize=2048)
+    def format_cents(value):
+        return f"R$ {value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    return format_cents
+
+_format_cents = _currency_formatter()
 
 def format_currency(value):
     """Format value as Brazilian currency"""
-    return f"R$ {value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    return _format_cents(round(float(value), 2))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_single(investment_type, total_rate_gross, term_days):
+    """Calculate period returns and tax rates for a single investment term"""
+    tax_rate_old = float(IR_RATES[np.searchsorted(IR_BRACKETS, term_days, side='right')])
+    tax_rate_old, tax_rate_new = default_tax_rate(tax_rate_old, investment_type)
+
+    gross_return_period = calculate_compound_return(total_rate_gross, term_days)
+
+    return {
+        'gross_return_period': gross_return_period,
+        'net_return_old_period': gross_return_period * (1 - tax_rate_old),
+        'net_return_new_period': gross_return_period * (1 - tax_rate_new),
+        'tax_rate_old': tax_rate_old,
+        'tax_rate_new': tax_rate_new,
+    }
+
+@dataclass
+class ScenarioBlock:
+    """Scenario results as parallel arrays, one element per term"""
+    labels: tuple
+    days: np.ndarray
+    tax_old: np.ndarray
+    gross_period: np.ndarray
+    net_old_period: np.ndarray
+    net_new_period: np.ndarray
+    net_old_annual: np.ndarray
+    cdi_net_old: np.ndarray
+    final_gross: np.ndarray
+    final_old: np.ndarray
+    final_new: np.ndarray
+    diff: np.ndarray
+    diff_pct: np.ndarray
+    # Display strings for diff/diff_pct, formatted once per scenario set
+    diff_fmt: tuple
+    diff_pct_fmt: tuple
+    # Term-invariant values
+    tax_new: float
+    gross_annual: float
+    net_new_annual: float
+    cdi_gross: float
+    cdi_net_new: float
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_scenarios(investment_type, return_type, cdi_value, investment_return,
+                      initial_investment, scenarios_days, scenario_labels):
+    """Calculate the scenario results for every term in scenarios_days"""
+    if return_type == '% CDI':
+        total_rate_gross = (investment_return / 100) * cdi_value
+    else:
+        total_rate_gross = investment_return
+
+    days_arr = np.asarray(scenarios_days, dtype=np.float64)
+
+    # Determine tax rate for current regime
+    current_tax_rate = IR_RATES[np.searchsorted(IR_BRACKETS, days_arr, side='right')]
+
+    # Apply investment type logic (the new regime rate does not depend on the term)
+    tax_old, tax_new = default_tax_rate(current_tax_rate, investment_type)
+    tax_old = np.broadcast_to(tax_old, days_arr.shape)
+
+    # Calculate returns
+    gross_return_period, net_return_old_period, net_return_new_period = compound_batch(
+        total_rate_gross, days_arr, tax_old, tax_new
+    )
+
+    # Calculate annual rates
+    net_annual_old = total_rate_gross * (1 - tax_old)
+    net_annual_new = total_rate_gross * (1 - tax_new)
+
+    # Calculate final amounts
+    final_gross = initial_investment * (1 + gross_return_period)
+    final_net_old = initial_investment * (1 + net_return_old_period)
+    final_net_new = initial_investment * (1 + net_return_new_period)
+
+    # Calculate difference
+    difference = final_net_new - final_net_old
+    difference_pct = np.divide(
+        difference * 100, final_net_old,
+        out=np.zeros_like(difference), where=final_net_old > 0
+    )
+
+    return ScenarioBlock(
+        labels=tuple(
+            scenario_labels[i] if i < len(scenario_labels) else f"{days}d"
+            for i, days in enumerate(scenarios_days)
+        ),
+        days=days_arr.astype(int),
+        tax_old=tax_old,
+        gross_period=gross_return_period,
+        net_old_period=net_return_old_period,
+        net_new_period=net_return_new_period,
+        net_old_annual=net_annual_old,
+        cdi_net_old=(net_annual_old / cdi_value) * 100,
+        final_gross=final_gross,
+        final_old=final_net_old,
+        final_new=final_net_new,
+        diff=difference,
+        diff_pct=difference_pct,
+        diff_fmt=tuple(format_currency(v) for v in difference),
+        diff_pct_fmt=tuple(np.char.mod('%.2f%%', difference_pct).tolist()),
+        tax_new=tax_new,
+        gross_annual=total_rate_gross,
+        net_new_annual=net_annual_new,
+        cdi_gross=(total_rate_gross / cdi_value) * 100,
+        cdi_net_new=(net_annual_new / cdi_value) * 100,
+    )
+
+def scenarios_frame(block):
+    """Build the scenarios display table from a ScenarioBlock"""
+    return pd.DataFrame({
+        'Prazo': block.labels,
+        'Dias': block.days,
+        'IR Atual (%)': np.char.mod('%.1f%%', block.tax_old * 100),
+        'IR Novo (%)': f"{block.tax_new*100:.1f}%",
+
+        # Period Returns
+        'Retorno Bruto Período': np.char.mod('%.2f%%', block.gross_period * 100),
+        'Retorno Líq. Atual Período': np.char.mod('%.2f%%', block.net_old_period * 100),
+        'Retorno Líq. Novo Período': np.char.mod('%.2f%%', block.net_new_period * 100),
+
+        # Annual Returns
+        'Taxa Bruta Anual': f"{block.gross_annual:.2f}%",
+        'Taxa Líq. Atual Anual': np.char.mod('%.2f%%', block.net_old_annual),
+        'Taxa Líq. Nova Anual': f"{block.net_new_annual:.2f}%",
+
+        # CDI Equivalents
+        '% CDI Bruto': f"{block.cdi_gross:.1f}%",
+        '% CDI Líq. Atual': np.char.mod('%.1f%%', block.cdi_net_old),
+        '% CDI Líq. Novo': f"{block.cdi_net_new:.1f}%",
+
+        # Final Values
+        'Valor Final Bruto': block.final_gross,
+        'Valor Final Atual': block.final_old,
+        'Valor Final Novo': block.final_new,
+        'Diferença (R$)': block.diff,
+        'Diferença (%)': block.diff_pct,
+    }, copy=False)
+
+@st.cache_resource(show_spinner=False)
+def plotly_ns():
+    """Import Plotly on first chart render instead of at script start"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    return go, make_subplots
+
+def session_figure(name, signature, build):
+    """Return the figure stored in session state, rebuilding it when signature changes"""
+    if st.session_state.get(f'{name}_sig') != signature:
+        # Validate the cached dict once; st.plotly_chart re-validates plain dicts on every call
+        go, _ = plotly_ns()
+        st.session_state[name] = go.Figure(build())
+        st.session_state[f'{name}_sig'] = signature
+    return st.session_state[name]
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_tab1_fig(final_gross, final_net_old, final_net_new, tax_old, tax_new):
+    """Build the final value and tax comparison chart for a single investment"""
+    go, make_subplots = plotly_ns()
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Valor Final do Investimento', 'Comparação de Impostos'),
+        specs=[[{"type": "bar"}, {"type": "bar"}]]
+    )
+
+    # Investment comparison chart
+    fig.add_trace(
+        go.Bar(
+            name='Bruto',
+            x=['Investimento'],
+            y=[final_gross],
+            marker_color='lightblue',
+            text=[format_currency(final_gross)],
+            textposition='auto'
+        ),
+        row=1, col=1
+    )
+
+    fig.add_trace(
+        go.Bar(
+            name='Líquido (Atual)',
+            x=['Investimento'],
+            y=[final_net_old],
+            marker_color='orange',
+            text=[format_currency(final_net_old)],
+            textposition='auto'
+        ),
+        row=1, col=1
+    )
+
+    fig.add_trace(
+        go.Bar(
+            name='Líquido (Novo)',
+            x=['Investimento'],
+            y=[final_net_new],
+            marker_color='green',
+            text=[format_currency(final_net_new)],
+            textposition='auto'
+        ),
+        row=1, col=1
+    )
+
+    # Tax comparison chart
+    fig.add_trace(
+        go.Bar(
+            name='Imposto Atual',
+            x=['Imposto'],
+            y=[tax_old],
+            marker_color='red',
+            text=[format_currency(tax_old)],
+            textposition='auto',
+            showlegend=False
+        ),
+        row=1, col=2
+    )
+
+    fig.add_trace(
+        go.Bar(
+            name='Imposto Novo',
+            x=['Imposto'],
+            y=[tax_new],
+            marker_color='darkred',
+            text=[format_currency(tax_new)],
+            textposition='auto',
+            showlegend=False
+        ),
+        row=1, col=2
+    )
+
+    fig.update_layout(
+        height=500,
+        showlegend=True,
+        yaxis=dict(title_text="Valor (R$)"),
+        yaxis2=dict(title_text="Valor (R$)")
+    )
+
+    return fig.to_dict()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_values_fig(labels, final_net_old, final_net_new, final_gross):
+    """Build the final value by term chart for the scenarios"""
+    go, _ = plotly_ns()
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(
+        x=labels,
+        y=final_net_old,
+        mode='lines+markers',
+        name='Regime Atual',
+        line=dict(color='orange', width=3),
+        marker=dict(size=8)
+    ))
+
+    fig.add_trace(go.Scattergl(
+        x=labels,
+        y=final_net_new,
+        mode='lines+markers',
+        name='Regime Novo',
+        line=dict(color='green', width=3),
+        marker=dict(size=8)
+    ))
+
+    fig.add_trace(go.Scattergl(
+        x=labels,
+        y=final_gross,
+        mode='lines+markers',
+        name='Valor Bruto',
+        line=dict(color='lightblue', width=2, dash='dash'),
+        marker=dict(size=6)
+    ))
+
+    fig.update_layout(
+        title="Evolução do Valor Final por Prazo",
+        xaxis_title="Prazo do Investimento",
+        yaxis_title="Valor Final (R$)",
+        hovermode='x unified',
+        height=400
+    )
+
+    return fig.to_dict()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_returns_fig(labels, return_old_period, return_new_period, rate_old_annual, rate_new_annual):
+    """Build the period and annual return charts for the scenarios"""
+    go, make_subplots = plotly_ns()
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Retornos do Período', 'Retornos Anuais'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}]]
+    )
+
+    # Period returns
+    fig.add_trace(
+        go.Bar(
+            x=labels,
+            y=return_old_period,
+            name='Atual - Período',
+            marker_color='orange',
+            opacity=0.7
+        ),
+        row=1, col=1
+    )
+
+    fig.add_trace(
+        go.Bar(
+            x=labels,
+            y=return_new_period,
+            name='Novo - Período',
+            marker_color='green',
+            opacity=0.7
+        ),
+        row=1, col=1
+    )
+
+    # Annual returns
+    fig.add_trace(
+        go.Bar(
+            x=labels,
+            y=rate_old_annual,
+            name='Atual - Anual',
+            marker_color='darkorange',
+            opacity=0.7,
+            showlegend=False
+        ),
+        row=1, col=2
+    )
+
+    fig.add_trace(
+        go.Bar(
+            x=labels,
+            y=rate_new_annual,
+            name='Novo - Anual',
+            marker_color='darkgreen',
+            opacity=0.7,
+            showlegend=False
+        ),
+        row=1, col=2
+    )
+
+    fig.update_layout(
+        height=400,
+        barmode='group',
+        yaxis=dict(title_text="Retorno (%)"),
+        yaxis2=dict(title_text="Taxa Anual (%)")
+    )
+
+    return fig.to_dict()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_cdi_fig(labels, cdi_net_old, cdi_net_new):
+    """Build the % CDI equivalence by term chart for the scenarios"""
+    go, _ = plotly_ns()
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(
+        x=labels,
+        y=cdi_net_old,
+        mode='lines+markers',
+        name='% CDI Atual',
+        line=dict(color='orange', width=3),
+        marker=dict(size=8)
+    ))
+
+    fig.add_trace(go.Scattergl(
+        x=labels,
+        y=cdi_net_new,
+        mode='lines+markers',
+        name='% CDI Novo',
+        line=dict(color='green', width=3),
+        marker=dict(size=8)
+    ))
+
+    # Add reference line at 100% CDI
+    fig.add_hline(
+        y=100,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text="100% CDI"
+    )
+
+    fig.update_layout(
+        title="Equivalência em % do CDI por Prazo",
+        xaxis_title="Prazo do Investimento",
+        yaxis_title="% do CDI",
+        hovermode='x unified',
+        height=400
+    )
+
+    return fig.to_dict()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_diff_fig(labels, diff, diff_pct, diff_fmt, diff_pct_fmt):
+    """Build the absolute and percentage difference charts for the scenarios"""
+    go, make_subplots = plotly_ns()
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Diferença Absoluta (R$)', 'Diferença Percentual (%)'),
+        vertical_spacing=0.12
+    )
+
+    # Shared x values and sign colors for both subplots, computed once
+    xs = list(labels)
+    colors, colors_pct = np.where(np.vstack((diff, diff_pct)) >= 0, 'green', 'red').tolist()
+    # Fixed label placement; negative percentage labels sit inside the bar, clear of the zero line
+    text_pos_pct = np.where(diff_pct >= 0, 'outside', 'inside').tolist()
+
+    # Absolute difference
+    fig.add_trace(
+        go.Bar(
+            x=xs,
+            y=diff,
+            marker_color=colors,
+            name='Diferença Absoluta',
+            text=diff_fmt,
+            textposition='outside',
+            cliponaxis=False,
+            hoverinfo='skip'
+        ),
+        row=1, col=1
+    )
+
+    # Percentage difference
+    fig.add_trace(
+        go.Bar(
+            x=xs,
+            y=diff_pct,
+            marker_color=colors_pct,
+            name='Diferença Percentual',
+            text=diff_pct_fmt,
+            textposition=text_pos_pct,
+            cliponaxis=False,
+            hoverinfo='skip',
+            showlegend=False
+        ),
+        row=2, col=1
+    )
+
+    fig.update_layout(
+        height=500,
+        hovermode=False,
+        yaxis=dict(title_text="Diferença (R$)"),
+        yaxis2=dict(title_text="Diferença (%)")
+    )
+
+    return fig.to_dict()
 
 # Page configuration
 st.set_page_config(
@@ -42,10 +518,9 @@ st.markdown("""
 st.markdown('<h1 class="main-header">💰 Comparador Renda Fixa</h1>', 
             unsafe_allow_html=True)
 
-# Main tabs
-tab1, tab2 = st.tabs(["📊 Análise Individual", "🔄 Comparar Múltiplos Cenários"])
-
-with tab1:
+@st.fragment
+def render_individual_analysis():
+    """Render the single investment inputs and results"""
     # Input section with better organization
     st.markdown("## 📊 Configurações do Investimento")
 
@@ -117,18 +592,6 @@ with tab1:
             key='investment_term_input'
         )
 
-    # Tax calculation
-    if term_input >= 720:
-        tax_rate_old = 0.15
-    elif term_input >= 360:
-        tax_rate_old = 0.175
-    elif term_input >= 180:
-        tax_rate_old = 0.2
-    else:
-        tax_rate_old = 0.225
-
-    tax_rate_old, tax_rate_new = default_tax_rate(tax_rate_old, investment_type_input_selector)
-
     # Calculations
     if return_type_input_selector == '% CDI':
         cdi_percentage = investment_return_input
@@ -137,16 +600,24 @@ with tab1:
         total_rate_gross = investment_return_input
         cdi_percentage = (investment_return_input / cdi_value_input) * 100
 
-    # Calculate compound returns
-    gross_return_period = calculate_compound_return(total_rate_gross, term_input)
-    net_return_old_period = gross_return_period * (1 - tax_rate_old)
-    net_return_new_period = gross_return_period * (1 - tax_rate_new)
+    # Tax rates and compound returns
+    is_taxable = investment_type_input_selector == 'Tributável'
+    single_result = compute_single(investment_type_input_selector, total_rate_gross, term_input)
+    tax_rate_old = single_result['tax_rate_old']
+    tax_rate_new = single_result['tax_rate_new']
+    gross_return_period = single_result['gross_return_period']
+    net_return_old_period = single_result['net_return_old_period']
+    net_return_new_period = single_result['net_return_new_period']
 
     # Calculate final amounts
     final_amount_gross = initial_investment * (1 + gross_return_period)
     final_amount_net_old = initial_investment * (1 + net_return_old_period)
     final_amount_net_new = initial_investment * (1 + net_return_new_period)
 
+    # Difference between the new and current regimes
+    delta_abs = final_amount_net_new - final_amount_net_old
+    delta_pct = delta_abs / final_amount_net_old * 100 if final_amount_net_old else 0.0
+
     # Calculate net annual rates
     total_rate_net_old = total_rate_gross * (1 - tax_rate_old)
     total_rate_net_new = total_rate_gross * (1 - tax_rate_new)
@@ -161,22 +632,16 @@ with tab1:
         st.write(f"**Prazo:** {term_input} dias")
         
         # Tax bracket explanation
-        if investment_type_input_selector == 'Tributável':
-            if term_input >= 720:
-                st.write("**Faixa:** Acima de 720 dias")
-            elif term_input >= 360:
-                st.write("**Faixa:** 361 a 720 dias")
-            elif term_input >= 180:
-                st.write("**Faixa:** 181 a 360 dias")
-            else:
-                st.write("**Faixa:** Até 180 dias")
+        if is_taxable:
+            bracket = np.searchsorted(IR_BRACKETS, term_input, side='right')
+            st.write(f"**Faixa:** {IR_BRACKET_LABELS[bracket]}")
 
     with col_tax2:
         st.success("🆕 **Regime Proposto**")
         st.write(f"**Taxa de IR:** {tax_rate_new * 100:.2f}%")
         st.write(f"**Tipo:** {investment_type_input_selector}")
         
-        if investment_type_input_selector == 'Tributável':
+        if is_taxable:
             st.write("**Nova regra:** Taxa fixa de 17,5%")
         else:
             st.write("**Nova regra:** Taxa de 5% para isentos")
@@ -209,12 +674,11 @@ with tab1:
         )
 
     with col_m4:
-        difference = final_amount_net_new - final_amount_net_old
         st.metric(
             "⚖️ Diferença",
-            format_currency(difference),
-            f"{'Melhor' if difference > 0 else 'Pior'} em {(final_amount_net_new - final_amount_net_old) / final_amount_net_old * 100:.2f}%",
-            delta_color="inverse" if difference < 0 else "normal"
+            format_currency(delta_abs),
+            f"{'Melhor' if delta_abs > 0 else 'Pior'} em {delta_pct:.2f}%",
+            delta_color="inverse" if delta_abs < 0 else "normal"
         )
 
     # Detailed comparison table
@@ -247,94 +711,28 @@ with tab1:
         ]
     }
 
-    results_df = pd.DataFrame(comparison_data)
-    st.dataframe(results_df, use_container_width=False, hide_index=True)
+    comparison_table = "| Métrica | Valor |\n| --- | --- |\n" + "\n".join(
+        f"| {metric} | {value} |"
+        for metric, value in zip(comparison_data['Métrica'], comparison_data['Valor'])
+    )
+    # Escape "R$" so it is not rendered as LaTeX
+    st.markdown(comparison_table.replace('$', '\\$'))
 
     # Visualization
     st.markdown("### 📊 Visualização Comparativa")
 
-    fig = make_subplots(
-        rows=1, cols=2,
-        subplot_titles=('Valor Final do Investimento', 'Comparação de Impostos'),
-        specs=[[{"type": "bar"}, {"type": "bar"}]]
-    )
-
-    # Investment comparison chart
-    fig.add_trace(
-        go.Bar(
-            name='Bruto',
-            x=['Investimento'],
-            y=[final_amount_gross],
-            marker_color='lightblue',
-            text=[format_currency(final_amount_gross)],
-            textposition='auto'
-        ),
-        row=1, col=1
-    )
-
-    fig.add_trace(
-        go.Bar(
-            name='Líquido (Atual)',
-            x=['Investimento'],
-            y=[final_amount_net_old],
-            marker_color='orange',
-            text=[format_currency(final_amount_net_old)],
-            textposition='auto'
-        ),
-        row=1, col=1
-    )
-
-    fig.add_trace(
-        go.Bar(
-            name='Líquido (Novo)',
-            x=['Investimento'],
-            y=[final_amount_net_new],
-            marker_color='green',
-            text=[format_currency(final_amount_net_new)],
-            textposition='auto'
-        ),
-        row=1, col=1
-    )
-
-    # Tax comparison chart
     tax_old = (final_amount_gross - initial_investment) * tax_rate_old
     tax_new = (final_amount_gross - initial_investment) * tax_rate_new
 
-    fig.add_trace(
-        go.Bar(
-            name='Imposto Atual',
-            x=['Imposto'],
-            y=[tax_old],
-            marker_color='red',
-            text=[format_currency(tax_old)],
-            textposition='auto',
-            showlegend=False
-        ),
-        row=1, col=2
-    )
-
-    fig.add_trace(
-        go.Bar(
-            name='Imposto Novo',
-            x=['Imposto'],
-            y=[tax_new],
-            marker_color='darkred',
-            text=[format_currency(tax_new)],
-            textposition='auto',
-            showlegend=False
-        ),
-        row=1, col=2
-    )
-
-    fig.update_layout(height=500, showlegend=True)
-    fig.update_yaxes(title_text="Valor (R$)")
+    tab1_args = (final_amount_gross, final_amount_net_old, final_amount_net_new, tax_old, tax_new)
+    fig = session_figure('fig_tab1', tab1_args, lambda: build_tab1_fig(*tab1_args))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
 
     # Summary conclusion using Streamlit components
     st.markdown("## 🎯 Resumo Executivo")
 
-    if final_amount_net_new > final_amount_net_old:
+    if delta_abs > 0:
         conclusion_type = "success"
         conclusion_text = "vantajoso"
         emoji = "✅"
@@ -343,8 +741,8 @@ with tab1:
         conclusion_text = "desvantajoso"
         emoji = "❌"
 
-    percentage_diff = abs((final_amount_net_new - final_amount_net_old) / final_amount_net_old * 100)
-    absolute_diff = abs(final_amount_net_new - final_amount_net_old)
+    percentage_diff = abs(delta_pct)
+    absolute_diff = abs(delta_abs)
     tax_diff_absolute = abs(tax_old - tax_new)
     tax_diff_percentage = abs((tax_new - tax_old) / tax_old * 100) if tax_old > 0 else 0
 
@@ -415,6 +813,192 @@ with tab1:
         **Impacto da mudança:** A nova alíquota de **{tax_rate_new * 100:.2f}%** representa uma {'redução' if tax_rate_new < tax_rate_old else 'aumento'} de **{tax_rate_diff_pp:.2f} pontos percentuais**.
         """)
 
+@st.fragment
+def render_scenarios_table(scenarios_df):
+    """Render the metric selection and the scenarios table"""
+    # Display options
+    st.markdown("### 📊 Selecione as Métricas para Visualizar")
+    
+    col_display1, col_display2, col_display3 = st.columns(3)
+    
+    with col_display1:
+        show_returns = st.checkbox("📈 Retornos", value=True, key="show_returns_scenarios")
+        show_period = st.checkbox("⏱️ Retornos do Período", value=True, key="show_period_scenarios")
+    
+    with col_display2:
+        show_annual = st.checkbox("📅 Retornos Anuais", value=True, key="show_annual_scenarios")
+        show_cdi = st.checkbox("📊 % CDI", value=True, key="show_cdi_scenarios")
+    
+    with col_display3:
+        show_values = st.checkbox("💰 Valores Finais", value=True, key="show_values_scenarios")
+        show_taxes = st.checkbox("🏛️ Alíquotas IR", value=False, key="show_taxes_scenarios")
+    
+    # Create display dataframe based on selections
+    display_columns = ['Prazo']
+    
+    if show_taxes:
+        display_columns.extend(['IR Atual (%)', 'IR Novo (%)'])
+    
+    if show_returns and show_period:
+        display_columns.extend([
+            'Retorno Bruto Período', 
+            'Retorno Líq. Atual Período', 
+            'Retorno Líq. Novo Período'
+        ])
+    
+    if show_returns and show_annual:
+        display_columns.extend([
+            'Taxa Bruta Anual', 
+            'Taxa Líq. Atual Anual', 
+            'Taxa Líq. Nova Anual'
+        ])
+    
+    if show_cdi:
+        display_columns.extend([
+            '% CDI Bruto', 
+            '% CDI Líq. Atual', 
+            '% CDI Líq. Novo'
+        ])
+    
+    if show_values:
+        display_columns.extend([
+            'Valor Final Atual', 
+            'Valor Final Novo', 
+            'Diferença (R$)'
+        ])
+    
+    # Display the table
+    display_df = scenarios_df[display_columns].rename(columns={'Diferença (R$)': 'Diferença'})
+    
+    # Currency columns are formatted at render time
+    currency_format = {
+        'Valor Final Atual': format_currency,
+        'Valor Final Novo': format_currency,
+        'Diferença': format_currency
+    }
+    
+    st.dataframe(
+        display_df.style.format(currency_format), 
+        use_container_width=True, 
+        hide_index=True,
+        column_config={
+            "Diferença": st.column_config.Column(
+                help="Diferença entre regime novo e atual"
+            )
+        }
+    )
+
+@st.fragment
+def render_analysis(scenario_block, scenarios_df, scenarios_sig):
+    """Render the scenario charts and insights, rerunning only this fragment on chart selection"""
+    # Charts section
+    if len(scenario_block.days) > 1:
+        st.markdown("### 📈 Visualizações Comparativas")
+        
+        active_chart = st.radio(
+            "Visualização",
+            ["💰 Valores Finais", "📊 Retornos (%)", "🎯 % CDI", "⚖️ Diferenças"],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="chart_tab"
+        )
+        
+        if active_chart == "💰 Valores Finais":
+            # Values comparison chart
+            fig_values = session_figure('fig_values', scenarios_sig, lambda: build_values_fig(
+                scenario_block.labels,
+                scenario_block.final_old,
+                scenario_block.final_new,
+                scenario_block.final_gross
+            ))
+        
+            st.plotly_chart(fig_values, use_container_width=True, config=PLOTLY_CONFIG)
+        
+        elif active_chart == "📊 Retornos (%)":
+            # Returns comparison chart
+            fig_returns = session_figure('fig_returns', scenarios_sig, lambda: build_returns_fig(
+                scenario_block.labels,
+                scenario_block.net_old_period * 100,
+                scenario_block.net_new_period * 100,
+                scenario_block.net_old_annual,
+                np.full(len(scenario_block.days), scenario_block.net_new_annual)
+            ))
+        
+            st.plotly_chart(fig_returns, use_container_width=True, config=PLOTLY_CONFIG)
+        
+        elif active_chart == "🎯 % CDI":
+            # CDI comparison chart
+            fig_cdi = session_figure('fig_cdi', scenarios_sig, lambda: build_cdi_fig(
+                scenario_block.labels,
+                scenario_block.cdi_net_old,
+                np.full(len(scenario_block.days), scenario_block.cdi_net_new)
+            ))
+        
+            st.plotly_chart(fig_cdi, use_container_width=True, config=PLOTLY_CONFIG)
+        
+        elif active_chart == "⚖️ Diferenças":
+            # Differences chart
+            fig_diff = session_figure('fig_diff', scenarios_sig, lambda: build_diff_fig(
+                scenario_block.labels,
+                scenario_block.diff,
+                scenario_block.diff_pct,
+                scenario_block.diff_fmt,
+                scenario_block.diff_pct_fmt
+            ))
+        
+            st.plotly_chart(fig_diff, use_container_width=True, config=PLOTLY_CONFIG)
+    
+    # Summary insights
+    st.markdown("### 🎯 Insights da Análise")
+    
+    # Find best and worst scenarios
+    i_best = int(scenario_block.diff.argmax())
+    i_worst = int(scenario_block.diff.argmin())
+    best_scenario = scenarios_df.iloc[i_best]
+    worst_scenario = scenarios_df.iloc[i_worst]
+    best_diff_fmt = scenario_block.diff_fmt[i_best]
+    best_diff_pct_fmt = scenario_block.diff_pct_fmt[i_best]
+    worst_diff_fmt = scenario_block.diff_fmt[i_worst]
+    worst_diff_pct_fmt = scenario_block.diff_pct_fmt[i_worst]
+    
+    col_insight1, col_insight2 = st.columns(2)
+    
+    with col_insight1:
+        if best_scenario['Diferença (R$)'] > 0:
+            st.metric(
+                label=f"✅ Melhor Cenário: {best_scenario['Prazo']}",
+                value=best_diff_fmt,
+                delta=best_diff_pct_fmt
+            )
+            st.caption(f"CDI Líquido: {best_scenario['% CDI Líq. Novo']} vs {best_scenario['% CDI Líq. Atual']}")
+        else:
+            st.metric(
+                label=f"📊 Menor Perda: {best_scenario['Prazo']}",
+                value=best_diff_fmt,
+                delta=best_diff_pct_fmt
+            )
+    
+    with col_insight2:
+        if worst_scenario['Diferença (R$)'] < 0:
+            st.metric(
+                label=f"❌ Pior Cenário: {worst_scenario['Prazo']}",
+                value=worst_diff_fmt,
+                delta=worst_diff_pct_fmt
+            )
+            st.caption(f"CDI Líquido: {worst_scenario['% CDI Líq. Novo']} vs {worst_scenario['% CDI Líq. Atual']}")
+        else:
+            st.metric(
+                label=f"📊 Menor Ganho: {worst_scenario['Prazo']}",
+                value=worst_diff_fmt,
+                delta=worst_diff_pct_fmt
+            )
+
+# Main tabs
+tab1, tab2 = st.tabs(["📊 Análise Individual", "🔄 Comparar Múltiplos Cenários"])
+
+with tab1:
+    render_individual_analysis()
+
 with tab2:
     st.markdown("## 🔄 Análise de Múltiplos Cenários")
     
@@ -484,31 +1068,23 @@ with tab2:
             help="Escolha entre prazos pré-definidos ou configure seus próprios prazos"
         )
     
-    # Calculate scenario parameters
-    if scenario_return_type == '% CDI':
-        scenario_cdi_percentage = scenario_investment_return
-        scenario_total_rate_gross = (scenario_investment_return / 100) * scenario_cdi_value
-    else:
-        scenario_total_rate_gross = scenario_investment_return
-        scenario_cdi_percentage = (scenario_investment_return / scenario_cdi_value) * 100
-    
     # Define scenarios based on selection
     if scenario_type == "Prazos Padrão":
-        scenarios_days = [30, 90, 180, 365, 720, 1080]
-        scenario_labels = ["1 mês", "3 meses", "6 meses", "1 ano", "2 anos", "3 anos"]
+        scenarios_days = STANDARD_SCENARIO_DAYS
+        scenario_labels = STANDARD_SCENARIO_LABELS
     else:
-        st.markdown("**Configure até 6 prazos personalizados:**")
+        st.markdown(f"**Configure até {MAX_SCENARIOS} prazos personalizados:**")
         custom_days = []
         custom_labels = []
         
         cols = st.columns(3)
-        for i in range(6):
+        for i in range(MAX_SCENARIOS):
             with cols[i % 3]:
                 days = st.number_input(
                     f"Prazo {i+1} (dias)", 
                     min_value=1, 
                     max_value=3650, 
-                    value=[30, 90, 180, 365, 720, 1080][i] if i < 6 else 30,
+                    value=STANDARD_SCENARIO_DAYS[i],
                     key=f"custom_days_{i}"
                 )
                 if days > 0:
@@ -520,403 +1096,23 @@ with tab2:
                     else:
                         custom_labels.append(f"{days//365}a{(days%365)//30}m" if days%365 > 0 else f"{days//365}a")
         
-        scenarios_days = custom_days[:6]  # Limit to 6 scenarios
-        scenario_labels = custom_labels[:6]
+        scenarios_days = custom_days[:MAX_SCENARIOS]
+        scenario_labels = custom_labels[:MAX_SCENARIOS]
     
     if scenarios_days:
         # Calculate scenarios
-        scenarios_data = []
-        
-        for i, days in enumerate(scenarios_days):
-            # Determine tax rate for current regime
-            if days >= 720:
-                current_tax_rate = 0.15
-            elif days >= 360:
-                current_tax_rate = 0.175
-            elif days >= 180:
-                current_tax_rate = 0.2
-            else:
-                current_tax_rate = 0.225
-            
-            # Apply investment type logic
-            if scenario_investment_type == 'Tributável':
-                tax_old = current_tax_rate
-                tax_new = 0.175
-            else:  # Isento
-                tax_old = 0.0
-                tax_new = 0.05
-            
-            # Calculate returns
-            gross_return_period = calculate_compound_return(scenario_total_rate_gross, days)
-            net_return_old_period = gross_return_period * (1 - tax_old)
-            net_return_new_period = gross_return_period * (1 - tax_new)
-            
-            # Calculate annual rates
-            gross_annual_rate = scenario_total_rate_gross
-            net_annual_old = gross_annual_rate * (1 - tax_old)
-            net_annual_new = gross_annual_rate * (1 - tax_new)
-            
-            # Calculate % CDI equivalents
-            cdi_gross = (gross_annual_rate / scenario_cdi_value) * 100
-            cdi_net_old = (net_annual_old / scenario_cdi_value) * 100
-            cdi_net_new = (net_annual_new / scenario_cdi_value) * 100
-            
-            # Calculate final amounts
-            final_gross = scenario_initial_investment * (1 + gross_return_period)
-            final_net_old = scenario_initial_investment * (1 + net_return_old_period)
-            final_net_new = scenario_initial_investment * (1 + net_return_new_period)
-            
-            # Calculate difference
-            difference = final_net_new - final_net_old
-            difference_pct = (difference / final_net_old) * 100 if final_net_old > 0 else 0
-            
-            scenarios_data.append({
-                'Prazo': scenario_labels[i] if i < len(scenario_labels) else f"{days}d",
-                'Dias': days,
-                'IR Atual (%)': f"{tax_old*100:.1f}%",
-                'IR Novo (%)': f"{tax_new*100:.1f}%",
-                
-                # Period Returns
-                'Retorno Bruto Período': f"{gross_return_period*100:.2f}%",
-                'Retorno Líq. Atual Período': f"{net_return_old_period*100:.2f}%",
-                'Retorno Líq. Novo Período': f"{net_return_new_period*100:.2f}%",
-                
-                # Annual Returns
-                'Taxa Bruta Anual': f"{gross_annual_rate:.2f}%",
-                'Taxa Líq. Atual Anual': f"{net_annual_old:.2f}%",
-                'Taxa Líq. Nova Anual': f"{net_annual_new:.2f}%",
-                
-                # CDI Equivalents
-                '% CDI Bruto': f"{cdi_gross:.1f}%",
-                '% CDI Líq. Atual': f"{cdi_net_old:.1f}%",
-                '% CDI Líq. Novo': f"{cdi_net_new:.1f}%",
-                
-                # Final Values
-                'Valor Final Bruto': final_gross,
-                'Valor Final Atual': final_net_old,
-                'Valor Final Novo': final_net_new,
-                'Diferença (R$)': difference,
-                'Diferença (%)': difference_pct,
-                
-                # Formatted values for display
-                'Valor Final Bruto (fmt)': format_currency(final_gross),
-                'Valor Final Atual (fmt)': format_currency(final_net_old),
-                'Valor Final Novo (fmt)': format_currency(final_net_new),
-                'Diferença (fmt)': format_currency(difference),
-            })
-        
-        scenarios_df = pd.DataFrame(scenarios_data)
-        
-        # Display options
-        st.markdown("### 📊 Selecione as Métricas para Visualizar")
-        
-        col_display1, col_display2, col_display3 = st.columns(3)
-        
-        with col_display1:
-            show_returns = st.checkbox("📈 Retornos", value=True, key="show_returns_scenarios")
-            show_period = st.checkbox("⏱️ Retornos do Período", value=True, key="show_period_scenarios")
-            
-        with col_display2:
-            show_annual = st.checkbox("📅 Retornos Anuais", value=True, key="show_annual_scenarios")
-            show_cdi = st.checkbox("📊 % CDI", value=True, key="show_cdi_scenarios")
-            
-        with col_display3:
-            show_values = st.checkbox("💰 Valores Finais", value=True, key="show_values_scenarios")
-            show_taxes = st.checkbox("🏛️ Alíquotas IR", value=False, key="show_taxes_scenarios")
-        
-        # Create display dataframe based on selections
-        display_columns = ['Prazo']
-        
-        if show_taxes:
-            display_columns.extend(['IR Atual (%)', 'IR Novo (%)'])
-        
-        if show_returns and show_period:
-            display_columns.extend([
-                'Retorno Bruto Período', 
-                'Retorno Líq. Atual Período', 
-                'Retorno Líq. Novo Período'
-            ])
-        
-        if show_returns and show_annual:
-            display_columns.extend([
-                'Taxa Bruta Anual', 
-                'Taxa Líq. Atual Anual', 
-                'Taxa Líq. Nova Anual'
-            ])
-        
-        if show_cdi:
-            display_columns.extend([
-                '% CDI Bruto', 
-                '% CDI Líq. Atual', 
-                '% CDI Líq. Novo'
-            ])
-        
-        if show_values:
-            display_columns.extend([
-                'Valor Final Atual (fmt)', 
-                'Valor Final Novo (fmt)', 
-                'Diferença (fmt)'
-            ])
-        
-        # Display the table
-        display_df = scenarios_df[display_columns].copy()
-        
-        # Rename columns for better display
-        column_renames = {
-            'Valor Final Atual (fmt)': 'Valor Final Atual',
-            'Valor Final Novo (fmt)': 'Valor Final Novo',
-            'Diferença (fmt)': 'Diferença'
-        }
-        display_df = display_df.rename(columns=column_renames)
-        
-        st.dataframe(
-            display_df, 
-            use_container_width=True, 
-            hide_index=True,
-            column_config={
-                "Diferença": st.column_config.TextColumn(
-                    help="Diferença entre regime novo e atual"
-                )
-            }
+        scenario_inputs = (
+            scenario_investment_type,
+            scenario_return_type,
+            scenario_cdi_value,
+            scenario_investment_return,
+            scenario_initial_investment,
+            tuple(scenarios_days),
+            tuple(scenario_labels)
         )
+        scenario_block = compute_scenarios(*scenario_inputs)
+        scenarios_df = scenarios_frame(scenario_block)
+        scenarios_sig = hash(scenario_inputs)
         
-        # Charts section
-        if len(scenarios_data) > 1:
-            st.markdown("### 📈 Visualizações Comparativas")
-            
-            chart_tabs = st.tabs([
-                "💰 Valores Finais", 
-                "📊 Retornos (%)", 
-                "🎯 % CDI", 
-                "⚖️ Diferenças"
-            ])
-            
-            with chart_tabs[0]:
-                # Values comparison chart
-                fig_values = go.Figure()
-                
-                fig_values.add_trace(go.Scatter(
-                    x=scenario_labels[:len(scenarios_data)],
-                    y=[d['Valor Final Atual'] for d in scenarios_data],
-                    mode='lines+markers',
-                    name='Regime Atual',
-                    line=dict(color='orange', width=3),
-                    marker=dict(size=8)
-                ))
-                
-                fig_values.add_trace(go.Scatter(
-                    x=scenario_labels[:len(scenarios_data)],
-                    y=[d['Valor Final Novo'] for d in scenarios_data],
-                    mode='lines+markers',
-                    name='Regime Novo',
-                    line=dict(color='green', width=3),
-                    marker=dict(size=8)
-                ))
-                
-                fig_values.add_trace(go.Scatter(
-                    x=scenario_labels[:len(scenarios_data)],
-                    y=[d['Valor Final Bruto'] for d in scenarios_data],
-                    mode='lines+markers',
-                    name='Valor Bruto',
-                    line=dict(color='lightblue', width=2, dash='dash'),
-                    marker=dict(size=6)
-                ))
-                
-                fig_values.update_layout(
-                    title="Evolução do Valor Final por Prazo",
-                    xaxis_title="Prazo do Investimento",
-                    yaxis_title="Valor Final (R$)",
-                    hovermode='x unified',
-                    height=400
-                )
-                
-                st.plotly_chart(fig_values, use_container_width=True)
-            
-            with chart_tabs[1]:
-                # Returns comparison chart
-                fig_returns = make_subplots(
-                    rows=1, cols=2,
-                    subplot_titles=('Retornos do Período', 'Retornos Anuais'),
-                    specs=[[{"secondary_y": False}, {"secondary_y": False}]]
-                )
-                
-                # Period returns
-                fig_returns.add_trace(
-                    go.Bar(
-                        x=scenario_labels[:len(scenarios_data)],
-                        y=[float(d['Retorno Líq. Atual Período'].rstrip('%')) for d in scenarios_data],
-                        name='Atual - Período',
-                        marker_color='orange',
-                        opacity=0.7
-                    ),
-                    row=1, col=1
-                )
-                
-                fig_returns.add_trace(
-                    go.Bar(
-                        x=scenario_labels[:len(scenarios_data)],
-                        y=[float(d['Retorno Líq. Novo Período'].rstrip('%')) for d in scenarios_data],
-                        name='Novo - Período',
-                        marker_color='green',
-                        opacity=0.7
-                    ),
-                    row=1, col=1
-                )
-                
-                # Annual returns
-                fig_returns.add_trace(
-                    go.Bar(
-                        x=scenario_labels[:len(scenarios_data)],
-                        y=[float(d['Taxa Líq. Atual Anual'].rstrip('%')) for d in scenarios_data],
-                        name='Atual - Anual',
-                        marker_color='darkorange',
-                        opacity=0.7,
-                        showlegend=False
-                    ),
-                    row=1, col=2
-                )
-                
-                fig_returns.add_trace(
-                    go.Bar(
-                        x=scenario_labels[:len(scenarios_data)],
-                        y=[float(d['Taxa Líq. Nova Anual'].rstrip('%')) for d in scenarios_data],
-                        name='Novo - Anual',
-                        marker_color='darkgreen',
-                        opacity=0.7,
-                        showlegend=False
-                    ),
-                    row=1, col=2
-                )
-                
-                fig_returns.update_layout(
-                    height=400,
-                    barmode='group'
-                )
-                fig_returns.update_yaxes(title_text="Retorno (%)", row=1, col=1)
-                fig_returns.update_yaxes(title_text="Taxa Anual (%)", row=1, col=2)
-                
-                st.plotly_chart(fig_returns, use_container_width=True)
-            
-            with chart_tabs[2]:
-                # CDI comparison chart
-                fig_cdi = go.Figure()
-                
-                fig_cdi.add_trace(go.Scatter(
-                    x=scenario_labels[:len(scenarios_data)],
-                    y=[float(d['% CDI Líq. Atual'].rstrip('%')) for d in scenarios_data],
-                    mode='lines+markers',
-                    name='% CDI Atual',
-                    line=dict(color='orange', width=3),
-                    marker=dict(size=8)
-                ))
-                
-                fig_cdi.add_trace(go.Scatter(
-                    x=scenario_labels[:len(scenarios_data)],
-                    y=[float(d['% CDI Líq. Novo'].rstrip('%')) for d in scenarios_data],
-                    mode='lines+markers',
-                    name='% CDI Novo',
-                    line=dict(color='green', width=3),
-                    marker=dict(size=8)
-                ))
-                
-                # Add reference line at 100% CDI
-                fig_cdi.add_hline(
-                    y=100, 
-                    line_dash="dash", 
-                    line_color="gray",
-                    annotation_text="100% CDI"
-                )
-                
-                fig_cdi.update_layout(
-                    title="Equivalência em % do CDI por Prazo",
-                    xaxis_title="Prazo do Investimento",
-                    yaxis_title="% do CDI",
-                    hovermode='x unified',
-                    height=400
-                )
-                
-                st.plotly_chart(fig_cdi, use_container_width=True)
-            
-            with chart_tabs[3]:
-                # Differences chart
-                fig_diff = make_subplots(
-                    rows=2, cols=1,
-                    subplot_titles=('Diferença Absoluta (R$)', 'Diferença Percentual (%)'),
-                    vertical_spacing=0.12
-                )
-                
-                # Absolute difference
-                colors = ['green' if d['Diferença (R$)'] >= 0 else 'red' for d in scenarios_data]
-                
-                fig_diff.add_trace(
-                    go.Bar(
-                        x=scenario_labels[:len(scenarios_data)],
-                        y=[d['Diferença (R$)'] for d in scenarios_data],
-                        marker_color=colors,
-                        name='Diferença Absoluta',
-                        text=[format_currency(d['Diferença (R$)']) for d in scenarios_data],
-                        textposition='auto'
-                    ),
-                    row=1, col=1
-                )
-                
-                # Percentage difference
-                colors_pct = ['green' if d['Diferença (%)'] >= 0 else 'red' for d in scenarios_data]
-                
-                fig_diff.add_trace(
-                    go.Bar(
-                        x=scenario_labels[:len(scenarios_data)],
-                        y=[d['Diferença (%)'] for d in scenarios_data],
-                        marker_color=colors_pct,
-                        name='Diferença Percentual',
-                        text=[f"{d['Diferença (%)']:.2f}%" for d in scenarios_data],
-                        textposition='auto',
-                        showlegend=False
-                    ),
-                    row=2, col=1
-                )
-                
-                fig_diff.update_layout(height=500)
-                fig_diff.update_yaxes(title_text="Diferença (R$)", row=1, col=1)
-                fig_diff.update_yaxes(title_text="Diferença (%)", row=2, col=1)
-                
-                st.plotly_chart(fig_diff, use_container_width=True)
-        
-        # Summary insights
-        st.markdown("### 🎯 Insights da Análise")
-        
-        # Find best and worst scenarios
-        best_scenario = max(scenarios_data, key=lambda x: x['Diferença (R$)'])
-        worst_scenario = min(scenarios_data, key=lambda x: x['Diferença (R$)'])
-        
-        col_insight1, col_insight2 = st.columns(2)
-        
-        with col_insight1:
-            if best_scenario['Diferença (R$)'] > 0:
-                st.success(f"""
-                ✅ **Melhor Cenário: {best_scenario['Prazo']}**
-                - Economia: {format_currency(best_scenario['Diferença (R$)'])}
-                - Diferença: {best_scenario['Diferença (%)']:.2f}%
-                - CDI Líquido: {best_scenario['% CDI Líq. Novo']} vs {best_scenario['% CDI Líq. Atual']}
-                """)
-            else:
-                st.info(f"""
-                📊 **Menor Perda: {best_scenario['Prazo']}**
-                - Diferença: {format_currency(best_scenario['Diferença (R$)'])}
-                - Impacto: {best_scenario['Diferença (%)']:.2f}%
-                """)
-        
-        with col_insight2:
-            if worst_scenario['Diferença (R$)'] < 0:
-                st.error(f"""
-                ❌ **Pior Cenário: {worst_scenario['Prazo']}**
-                - Perda: {format_currency(abs(worst_scenario['Diferença (R$)']))}
-                - Diferença: {worst_scenario['Diferença (%)']:.2f}%
-                - CDI Líquido: {worst_scenario['% CDI Líq. Novo']} vs {worst_scenario['% CDI Líq. Atual']}
-                """)
-            else:
-                st.info(f"""
-                📊 **Menor Ganho: {worst_scenario['Prazo']}**
-                - Economia: {format_currency(worst_scenario['Diferença (R$)'])}
-                - Diferença: {worst_scenario['Diferença (%)']:.2f}%
-                """)
+        render_scenarios_table(scenarios_df)
+        render_analysis(scenario_block, scenarios_df, scenarios_sig)